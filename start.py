@@ -9,6 +9,8 @@ from twsaucenao.server import TwitterSauce
 mentioned_interval = float(config.get('Twitter', 'mentioned_interval', fallback=15.0))
 monitored_interval = float(config.get('Twitter', 'monitored_interval', fallback=60.0))
 search_interval = float(config.get('Twitter', 'search_interval', fallback=60.0))
+stream_mentions = config.getboolean('Twitter', 'stream_mentions', fallback=False)
+workers = config.getint('Twitter', 'workers', fallback=8)
 
 twitter = TwitterSauce()
 
@@ -40,6 +42,11 @@ async def mentions() -> None:
     while True:
         try:
             # Mentions
+            if stream_mentions:
+                delay = await twitter.stream_mentions()
+                await asyncio.sleep(delay)
+                continue
+
             await twitter.check_mentions()
             await asyncio.sleep(mentioned_interval)
         except Exception:
@@ -77,6 +84,9 @@ async def cleanup() -> None:
             stale_count = TweetCache.purge()
             print(f"\nPurging {stale_count:,} stale cache entries from the database")
 
+            stale_count = TweetSauceCache.purge()
+            print(f"Purging {stale_count:,} stale sauce cache entries from the database")
+
             # Sauce analytics
             sauce_count = TweetSauceCache.sauce_count(900)
             print(f"We've processed {sauce_count:,} new sauce queries!")
@@ -102,6 +112,7 @@ async def main() -> None:
 
     tasks.append(monitored())
     tasks.append(cleanup())
+    tasks.extend(twitter.worker() for _ in range(workers))
 
     await asyncio.gather(*tasks)
 
@@ -1,4 +1,7 @@
+import asyncio
+import functools
 import logging
+import typing
 
 import tweepy
 
@@ -32,6 +35,21 @@ def _twitter_api(key: str, secret: str, token: str, token_secret: str):
     return _api
 
 
+async def run_async(func: typing.Callable, *args, **kwargs):
+    """
+    Run a blocking Twitter API call in the default executor so it doesn't stall the event loop
+    Args:
+        func (Callable): The blocking function to call
+        *args: Positional arguments to pass to `func`
+        **kwargs: Keyword arguments to pass to `func`
+
+    Returns:
+        The return value of `func`
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
 api = _twitter_api(config.get('Twitter', 'consumer_key'), config.get('Twitter', 'consumer_secret'),
                    config.get('Twitter', 'access_token'), config.get('Twitter', 'access_secret'))
 
@@ -3,7 +3,7 @@ import typing
 
 import pysaucenao
 import tweepy
-from pony.orm import commit, count, Database, delete, Json, Optional, PrimaryKey, Required, db_session
+from pony.orm import commit, composite_index, count, Database, delete, Json, Optional, PrimaryKey, Required, db_session
 from pysaucenao import GenericSource
 from pysaucenao.containers import SauceNaoResults
 
@@ -73,21 +73,28 @@ class TweetCache(db.Entity):
     # noinspection PyTypeChecker
     @staticmethod
     @db_session
-    def purge(cutoff=86400):
+    def purge(cutoff=86400, media_cutoff=604800):
         """
         Purge old entries from the tweet cache
+        Tweets with media are kept around longer, since they are the parent posts we traverse to when multiple people
+        request the sauce for the same image, and their media won't change.
         Args:
             cutoff (int): Purge cache entries older than `cutoff` seconds. (Default is 1-day)
+            media_cutoff (int): Purge cache entries with media older than `media_cutoff` seconds. (Default is 1-week)
 
         Returns:
             int: The number of cache entries that have been purged (for logging)
         """
-        cutoff_ts = int(time.time()) - cutoff
-        stale_count = count(c for c in TweetCache if c.created_at <= cutoff_ts)
+        now = int(time.time())
+        cutoff_ts = now - cutoff
+        media_cutoff_ts = now - media_cutoff
+        stale_count = count(c for c in TweetCache if (c.created_at <= cutoff_ts and not c.has_media)
+                            or c.created_at <= media_cutoff_ts)
 
         # No need to perform a delete query if there's nothing to delete
         if stale_count:
-            delete(c for c in TweetCache if c.created_at <= cutoff_ts)
+            delete(c for c in TweetCache if (c.created_at <= cutoff_ts and not c.has_media)
+                   or c.created_at <= media_cutoff_ts)
 
         return stale_count
 
@@ -110,29 +117,36 @@ class TweetSauceCache(db.Entity):
     sauce_index     = Optional(str, 255)
     media_id        = Optional(int, size=64)
     trigger         = Optional(str, 50)
+    failed          = Optional(bool, sql_default=False)
     created_at      = Required(int, size=64, index=True)
+    composite_index(tweet_id, index_no)
 
     @staticmethod
     @db_session
-    def fetch(tweet_id: int, index_no: int = 0, cutoff: int = 86400) -> typing.Optional['TweetSauceCache']:
+    def fetch(tweet_id: int, index_no: int = 0, cutoff: int = 86400,
+              failed_cutoff: int = 300) -> typing.Optional['TweetSauceCache']:
         """
         Attempt to load a cached saucenao lookup
         Args:
             tweet_id(int): Tweet ID to look up
             index_no (int): The media indice for tweets with multiple media uploads
             cutoff (int): Only retrieve cache entries up to `cutoff` seconds old. (Default is 1-day)
+            failed_cutoff (int): Only retrieve lookups that failed due to a SauceNao error up to `failed_cutoff`
+                seconds old. (Default is 5-minutes)
 
         Returns:
-            typing.Optional[TweetSauceCache]
+            typing.Optional[TweetSauceCache]: None if this media hasn't been looked up yet (or the entry expired).
+                A lookup that found nothing is still cached, as an entry whose sauce is None.
         """
         now = int(time.time())
         cutoff_ts = 0 if not cutoff else (now - cutoff)
+        failed_cutoff_ts = 0 if not failed_cutoff else (now - failed_cutoff)
 
         sauce = TweetSauceCache.get(tweet_id=tweet_id, index_no=index_no)
         if sauce:
             log.debug(f'[SYSTEM] Sauce cache hit on index {index_no} for tweet {tweet_id}')
 
-            if sauce.created_at < cutoff_ts:
+            if sauce.created_at < (failed_cutoff_ts if sauce.failed else cutoff_ts):
                 log.info(f'[SYSTEM] Sauce cache query on index {index_no} for tweet {tweet_id} has expired')
                 return None
 
@@ -141,7 +155,8 @@ class TweetSauceCache(db.Entity):
     @staticmethod
     @db_session
     def set(tweet: TweetCache, sauce_results: typing.Optional[SauceNaoResults] = None, index_no: int = 0,
-            trigger: str = TRIGGER_MENTION, media_id: typing.Optional[int] = None) -> 'TweetSauceCache':
+            trigger: str = TRIGGER_MENTION, media_id: typing.Optional[int] = None,
+            failed: bool = False) -> 'TweetSauceCache':
         """
         Cache a SauceNao query
         Args:
@@ -150,6 +165,8 @@ class TweetSauceCache(db.Entity):
             index_no (int): The media indice for tweets with multiple media uploads
             trigger (str): The event that triggered the sauce lookup (purely for analytics)
             media_id (Optional[int]): Media ID if a video preview was uploaded with this tweet
+            failed (bool): True if the lookup failed due to a (likely transient) SauceNao error. These are only
+                cached briefly.
 
         Returns:
             TweetSauceCache
@@ -169,6 +186,7 @@ class TweetSauceCache(db.Entity):
                     index_no=index_no,
                     trigger=trigger,
                     media_id=media_id or 0,
+                    failed=failed,
                     created_at=int(time.time())
             )
             return _cache
@@ -223,6 +241,27 @@ class TweetSauceCache(db.Entity):
 
         return sauce_count
 
+    # noinspection PyTypeChecker
+    @staticmethod
+    @db_session
+    def purge(cutoff=86400):
+        """
+        Purge old entries from the sauce cache
+        Args:
+            cutoff (int): Purge cache entries older than `cutoff` seconds. (Default is 1-day)
+
+        Returns:
+            int: The number of cache entries that have been purged (for logging)
+        """
+        cutoff_ts = int(time.time()) - cutoff
+        stale_count = count(s for s in TweetSauceCache if s.created_at <= cutoff_ts)
+
+        # No need to perform a delete query if there's nothing to delete
+        if stale_count:
+            delete(s for s in TweetSauceCache if s.created_at <= cutoff_ts)
+
+        return stale_count
+
     @property
     def sauce(self) -> typing.Optional[GenericSource]:
         """
@@ -271,4 +310,97 @@ class TwitterBlocklist(db.Entity):
         )
 
 
+class TwitterCheckpoint(db.Entity):
+    name            = PrimaryKey(str, 255)
+    tweet_id        = Required(int, size=64)
+    updated_at      = Required(int, size=64)
+
+    @staticmethod
+    @db_session
+    def fetch(name: str) -> typing.Optional[int]:
+        """
+        Retrieve the last tweet ID we processed for the given timeline
+        Args:
+            name (str): The timeline name (e.g. mentions, or monitored:{account})
+
+        Returns:
+            typing.Optional[int]: The tweet ID, or None if we have never processed this timeline before
+        """
+        checkpoint = TwitterCheckpoint.get(name=name)
+        return checkpoint.tweet_id if checkpoint else None
+
+    @staticmethod
+    @db_session
+    def set(name: str, tweet_id: int) -> 'TwitterCheckpoint':
+        """
+        Persist the last tweet ID we processed for the given timeline so we can resume from it after a restart
+        Args:
+            name (str): The timeline name (e.g. mentions, or monitored:{account})
+            tweet_id (int): The ID cutoff
+
+        Returns:
+            TwitterCheckpoint
+        """
+        checkpoint = TwitterCheckpoint.get(name=name)
+        if checkpoint:
+            checkpoint.tweet_id = tweet_id
+            checkpoint.updated_at = int(time.time())
+            return checkpoint
+
+        return TwitterCheckpoint(
+                name=name,
+                tweet_id=tweet_id,
+                updated_at=int(time.time())
+        )
+
+
+def _table_exists(table: str) -> bool:
+    if db.provider_name == 'mysql':
+        return bool(db.select("SELECT COUNT(*) FROM information_schema.tables "
+                              "WHERE table_schema = DATABASE() AND table_name = $table")[0])
+
+    return bool(db.select("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = $table")[0])
+
+
+def _column_exists(table: str, column: str) -> bool:
+    if db.provider_name == 'mysql':
+        return bool(db.select("SELECT COUNT(*) FROM information_schema.columns "
+                              "WHERE table_schema = DATABASE() AND table_name = $table AND column_name = $column")[0])
+
+    return column in [row[1] for row in db.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _index_exists(table: str, index: str) -> bool:
+    if db.provider_name == 'mysql':
+        return bool(db.select("SELECT COUNT(*) FROM information_schema.statistics "
+                              "WHERE table_schema = DATABASE() AND table_name = $table AND index_name = $index")[0])
+
+    return bool(db.select("SELECT COUNT(*) FROM sqlite_master "
+                          "WHERE type = 'index' AND tbl_name = $table AND name = $index")[0])
+
+
+@db_session
+def _migrate() -> None:
+    """
+    Bring databases created by older versions of the bot up to date.
+    Pony only creates tables that are missing entirely, so anything added to an existing table has to be added here
+    before the mapping is generated.
+    Returns:
+        None
+    """
+    if not _table_exists('TweetSauceCache'):
+        return
+
+    if not _column_exists('TweetSauceCache', 'failed'):
+        log.warning('[SYSTEM] Adding the failed column to the TweetSauceCache table')
+        db.execute("ALTER TABLE TweetSauceCache ADD COLUMN failed BOOLEAN DEFAULT 0")
+
+    if not _index_exists('TweetSauceCache', 'idx_tweetsaucecache__tweet_id_index_no'):
+        log.warning('[SYSTEM] Adding the (tweet_id, index_no) index to the TweetSauceCache table')
+        db.execute("CREATE INDEX idx_tweetsaucecache__tweet_id_index_no ON TweetSauceCache (tweet_id, index_no)")
+
+    commit()
+
+
+_migrate()
 db.generate_mapping(create_tables=True)
@@ -7,6 +7,7 @@ import twython
 from pysaucenao import AnimeSource, SauceNao
 from twython import Twython
 
+from twsaucenao.api import run_async
 from twsaucenao.config import config
 from twsaucenao.models.database import TRIGGER_SELF, TweetCache, TweetSauceCache
 from twsaucenao.tracemoe import tracemoe
@@ -52,7 +53,8 @@ class SauceManager:
         if cache:
             return cache
 
-        media = TweetManager.extract_media(self.tweet_cache.tweet)[index]
+        # SauceNao doesn't need the full resolution image, so we request Twitter's "small" variant (680px max) instead
+        media = TweetManager.extract_media(self.tweet_cache.tweet)[index] + ':small'
 
         file = media
         if self._downloads_enabled:
@@ -141,7 +143,7 @@ class SauceManager:
         Upload a video to Twitter and return the media ID for embedding
         """
         try:
-            tw_response = self.twython.upload_video(media=media, media_type='video/mp4')
+            tw_response = await run_async(self.twython.upload_video, media=media, media_type='video/mp4')
             return int(tw_response['media_id'])
         except twython.exceptions.TwythonError as error:
             self._log.error(f"An error occurred while uploading a video preview: {error.msg}")
@@ -1,6 +1,8 @@
 import asyncio
+import collections
 import logging
 import reprlib
+import time
 import typing
 
 import tweepy
@@ -11,14 +13,15 @@ from pysaucenao import AnimeSource, BooruSource, DailyLimitReachedException, Man
 from tracemoe import ATraceMoe
 from twython import Twython
 
-from twsaucenao.api import api
+from twsaucenao.api import api, run_async
 from twsaucenao.config import config
 from twsaucenao.errors import TwSauceNoMediaException
 from twsaucenao.lang import lang
-from twsaucenao.models.database import TRIGGER_MENTION, TRIGGER_MONITORED, TweetCache, TweetSauceCache
+from twsaucenao.models.database import TRIGGER_MENTION, TRIGGER_MONITORED, TweetCache, TweetSauceCache, \
+    TwitterCheckpoint
 from twsaucenao.pixiv import Pixiv
 from twsaucenao.sauce import SauceManager
-from twsaucenao.twitter import ReplyLine, TweetManager
+from twsaucenao.twitter import MentionStreamListener, ReplyLine, TweetManager
 
 
 class TwitterSauce:
@@ -44,32 +47,141 @@ class TwitterSauce:
         # Pixiv
         self.pixiv = Pixiv()
 
+        # For limiting the length of the title/author in replies
+        self._repr = reprlib.Repr()
+        self._repr.maxstring = 32
+        self._repr_long = reprlib.Repr()
+        self._repr_long.maxstring = 128
+
         # Cache some information about ourselves
         self.my = api.me()
         self.log.info(f"Connected as: {self.my.screen_name}")
 
-        # Image URL's are md5 hashed and cached here to prevent duplicate API queries. This is cleared every 24-hours.
-        # I'll update this in the future to use a real caching mechanism (database or redis)
-        self._cached_results = {}
+        # Tweets waiting to be processed by our worker pool. See worker()
+        self._queue = asyncio.Queue(maxsize=256)
+
+        # The latest ID cutoff and the ID's of tweets still queued or being processed for each timeline checkpoint.
+        # Persisted checkpoints are held back behind anything in flight so we don't skip it if we're restarted.
+        self._cutoffs = {}  # type: typing.Dict[str, int]
+        self._in_flight = collections.defaultdict(set)  # type: typing.Dict[str, typing.Set[int]]
+
+        # Limits how many SauceNao lookups we perform concurrently so we don't immediately trip the short API limit
+        self._sauce_semaphore = asyncio.Semaphore(config.getint('SauceNao', 'concurrent_lookups', fallback=4))
+
+        # Cleared while we're being throttled by SauceNao. The short limit backoff doubles each time we trip it again.
+        self._limit_gate = asyncio.Event()
+        self._limit_gate.set()
+        self._limit_backoff = 5.0
+
+        # Circuit breaker; lookups are skipped until _circuit_open_until after too many consecutive SauceNao errors
+        self._consecutive_errors = 0
+        self._circuit_open_until = 0.0
+
+        # Seconds to wait before reconnecting the mention stream; doubles each time the stream is rate limited
+        self._stream_backoff = 60.0
+
+        # Sauce lookups currently in progress, keyed by (tweet_id, index_no)
+        self._pending_lookups = {}  # type: typing.Dict[typing.Tuple[int, int], asyncio.Future]
 
         # A cached list of ID's for parent posts we've already processed
         # Used in the check_monitored() method to prevent re-posting sauces when posts are re-tweeted
-        self._posts_processed = []
+        # Only the most recent entries are kept, oldest are evicted first
+        self._posts_processed = collections.OrderedDict()  # type: typing.OrderedDict[int, None]
+        self._posts_processed_max = 10000
 
-        # The ID cutoff, we populate this once via an initial query at startup
-        try:
-            self.mention_id = tweepy.Cursor(api.mentions_timeline, tweet_mode='extended', count=1).items(1).next().id
-        except StopIteration:
-            self.mention_id = 0
+        # The ID cutoff, this is persisted between restarts. Otherwise, we populate it once via an initial query
+        self.mention_id = TwitterCheckpoint.fetch('mentions')
+        if self.mention_id is None:
+            try:
+                self.mention_id = tweepy.Cursor(api.mentions_timeline, tweet_mode='extended', count=1).items(1).next().id
+            except StopIteration:
+                self.mention_id = 0
+            TwitterCheckpoint.set('mentions', self.mention_id)
 
-        try:
-            self.self_id = tweepy.Cursor(api.user_timeline, tweet_mode='extended', count=1).items(1).next().id
-        except StopIteration:
-            self.self_id = 0
+        self.self_id = TwitterCheckpoint.fetch('self')
+        if self.self_id is None:
+            try:
+                self.self_id = tweepy.Cursor(api.user_timeline, tweet_mode='extended', count=1).items(1).next().id
+            except StopIteration:
+                self.self_id = 0
+            TwitterCheckpoint.set('self', self.self_id)
 
         self.monitored_since = {}
+        self.monitored_accounts = tuple(
+                a.strip() for a in config.get('Twitter', 'monitored_accounts', fallback='').split(',') if a.strip()
+        )
 
     # noinspection PyBroadException
+    async def worker(self) -> None:
+        """
+        Process tweets queued up by check_self(), check_mentions() and check_monitored().
+        Several of these are run concurrently to form a worker pool, which smooths bursts of tweets out into a steady
+        stream of sauce lookups.
+        Returns:
+            None
+        """
+        while True:
+            checkpoint, handler, args = await self._queue.get()
+            tweet = args[-1]
+            try:
+                await handler(*args)
+            except Exception:
+                self.log.exception("An unknown error occurred while processing a queued tweet")
+
+            try:
+                self._in_flight[checkpoint].discard(tweet.id)
+                self._save_checkpoint(checkpoint)
+            except Exception:
+                self.log.exception(f"An unknown error occurred while saving the {checkpoint} checkpoint")
+            finally:
+                self._queue.task_done()
+
+    async def _enqueue(self, checkpoint: str, cutoff: int, tweets: list, handler, *args) -> None:
+        """
+        Queue tweets from a timeline up for processing by the worker pool.
+        The timeline's persisted checkpoint only advances past a tweet once a worker has finished with it.
+        Args:
+            checkpoint (str): The timeline checkpoint name (e.g. mentions, or monitored:{account})
+            cutoff (int): The new ID cutoff for this timeline
+            tweets (list): The tweets to process
+            handler: Coroutine function to process each tweet with; called as handler(*args, tweet)
+            *args: Any additional arguments to pass to the handler
+
+        Returns:
+            None
+        """
+        # Every tweet is marked in-flight up front, so a worker finishing the first one can't advance the checkpoint
+        # past the others before they've been queued
+        in_flight = self._in_flight[checkpoint]
+        in_flight.update(tweet.id for tweet in tweets)
+
+        queued = 0
+        try:
+            for tweet in tweets:
+                await self._queue.put((checkpoint, handler, (*args, tweet)))
+                queued += 1
+        finally:
+            # Anything we failed to queue will never reach a worker, so it mustn't hold the checkpoint back forever
+            in_flight.difference_update(tweet.id for tweet in tweets[queued:])
+
+        self._cutoffs[checkpoint] = cutoff
+        self._save_checkpoint(checkpoint)
+
+    def _save_checkpoint(self, checkpoint: str) -> None:
+        """
+        Persist a timeline's ID cutoff, held back to just before the oldest tweet we haven't finished processing yet
+        Args:
+            checkpoint (str): The timeline checkpoint name
+
+        Returns:
+            None
+        """
+        in_flight = self._in_flight[checkpoint]
+        if in_flight:
+            TwitterCheckpoint.set(checkpoint, min(in_flight) - 1)
+        elif checkpoint in self._cutoffs:
+            TwitterCheckpoint.set(checkpoint, self._cutoffs[checkpoint])
+
     async def check_self(self) -> None:
         """
         Check for new posts from our own account to process
@@ -77,35 +189,44 @@ class TwitterSauce:
             None
         """
         self.log.info(f"[{self.my.screen_name}] Retrieving posts since tweet {self.self_id}")
-        posts = [*tweepy.Cursor(api.user_timeline, since_id=self.self_id, tweet_mode='extended').items()]
+        posts = await run_async(lambda: [*tweepy.Cursor(api.user_timeline, since_id=self.self_id, tweet_mode='extended').items()])
+        if not posts:
+            return
 
-        # Filter tweets without a reply AND attachment
-        for tweet in posts:
-            try:
-                # Update the ID cutoff before attempting to parse the tweet
-                self.self_id = max([self.self_id, tweet.id])
-                self.log.debug(f"[{self.my.screen_name}] New self-post max ID cutoff: {self.self_id}")
+        # Update the ID cutoff before attempting to parse any tweets
+        self.self_id = max(self.self_id, max(tweet.id for tweet in posts))
+        self.log.debug(f"[{self.my.screen_name}] New self-post max ID cutoff: {self.self_id}")
 
-                # Make sure this isn't a retweet
-                if tweet.full_text.startswith('RT @'):
-                    self.log.debug(f"[{self.my.screen_name}] Skipping a re-tweet")
-                    continue
+        await self._enqueue('self', self.self_id, posts, self._process_self)
 
-                # Attempt to parse the tweets media content
-                original_cache, media_cache, media = self.get_closest_media(tweet, self.my.screen_name)
+    # noinspection PyBroadException
+    async def _process_self(self, tweet) -> None:
+        """
+        Look up and respond to a single post from our own account
+        Args:
+            tweet: tweepy.models.Status
 
-                # Get the sauce!
-                sauce_cache = await self.get_sauce(media_cache, log_index=self.my.screen_name)
-                await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
-                                      blocked=media_cache.blocked)
-            except TwSauceNoMediaException:
-                self.log.debug(f"[{self.my.screen_name}] Tweet {tweet.id} has no media to process, ignoring")
-                continue
-            except Exception:
-                self.log.exception(f"[{self.my.screen_name}] An unknown error occurred while processing tweet {tweet.id}")
-                continue
+        Returns:
+            None
+        """
+        try:
+            # Make sure this isn't a retweet
+            if tweet.full_text.startswith('RT @'):
+                self.log.debug(f"[{self.my.screen_name}] Skipping a re-tweet")
+                return
+
+            # Attempt to parse the tweets media content
+            original_cache, media_cache, media = await self.get_closest_media(tweet, self.my.screen_name)
+
+            # Get the sauce!
+            sauce_cache = await self.get_sauce(media_cache, log_index=self.my.screen_name)
+            await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
+                                  blocked=media_cache.blocked)
+        except TwSauceNoMediaException:
+            self.log.debug(f"[{self.my.screen_name}] Tweet {tweet.id} has no media to process, ignoring")
+        except Exception:
+            self.log.exception(f"[{self.my.screen_name}] An unknown error occurred while processing tweet {tweet.id}")
 
-    # noinspection PyBroadException
     async def check_mentions(self) -> None:
         """
         Check for any new mentions we need to parse
@@ -113,39 +234,96 @@ class TwitterSauce:
             None
         """
         self.log.info(f"[{self.my.screen_name}] Retrieving mentions since tweet {self.mention_id}")
-        mentions = [*tweepy.Cursor(api.mentions_timeline, since_id=self.mention_id, tweet_mode='extended').items()]
+        mentions = await run_async(lambda: [*tweepy.Cursor(api.mentions_timeline, since_id=self.mention_id, tweet_mode='extended').items()])
+        if not mentions:
+            return
 
-        # Filter tweets without a reply AND attachment
-        for tweet in mentions:
-            try:
-                # Update the ID cutoff before attempting to parse the tweet
-                self.mention_id = max([self.mention_id, tweet.id])
-                self.log.debug(f"[{self.my.screen_name}] New max ID cutoff: {self.mention_id}")
+        # Update the ID cutoff before attempting to parse any tweets
+        self.mention_id = max(self.mention_id, max(tweet.id for tweet in mentions))
+        self.log.debug(f"[{self.my.screen_name}] New max ID cutoff: {self.mention_id}")
+
+        # Cache the parents of any replies in bulk before we start traversing them
+        await self.twitter.prefetch_tweets([t.in_reply_to_status_id for t in mentions if t.in_reply_to_status_id])
+
+        await self._enqueue('mentions', self.mention_id, mentions, self._process_mention)
 
-                # Make sure we aren't mentioning ourselves
-                if tweet.author.id == self.my.id:
-                    self.log.debug(f"[{self.my.screen_name}] Skipping a self-referencing tweet")
+    async def stream_mentions(self) -> float:
+        """
+        Respond to mentions as they are pushed to us through Twitter's streaming API.
+        Anything we missed while disconnected is caught up on through the mentions timeline first.
+        Returns:
+            float: Seconds to wait before reconnecting once the stream has disconnected
+        """
+        queue = asyncio.Queue()
+        listener = MentionStreamListener(asyncio.get_event_loop(), queue)
+        stream = tweepy.Stream(auth=api.auth, listener=listener)
+        stream.filter(track=[f"@{self.my.screen_name}"], is_async=True)
+        self.log.info(f"[{self.my.screen_name}] Streaming mentions")
+
+        try:
+            # Anything streamed to us during the catch-up pass is skipped below via the catch-up ID cutoff
+            await self.check_mentions()
+            catchup_id = self.mention_id
+
+            while stream.running:
+                try:
+                    tweet = await asyncio.wait_for(queue.get(), 30.0)
+                except asyncio.TimeoutError:
                     continue
 
-                # Attempt to parse the tweets media content
-                original_cache, media_cache, media = self.get_closest_media(tweet, self.my.screen_name)
-                if media_cache.tweet.author.id == self.my.id:
-                    self.log.info("Not performing a sauce lookup to our own tweet")
+                # The stream doesn't guarantee tweets arrive in order, so only the catch-up cutoff is a hard floor
+                if tweet.id <= catchup_id:
+                    self.log.debug(f"[{self.my.screen_name}] Skipping streamed tweet {tweet.id} handled by the catch-up pass")
                     continue
 
-                # Did we request a specific index?
-                index = self._determine_requested_index(tweet, media_cache)
+                self.mention_id = max(self.mention_id, tweet.id)
+                await self._enqueue('mentions', self.mention_id, [tweet], self._process_mention)
+        finally:
+            stream.disconnect()
 
-                # Get the sauce!
-                sauce_cache = await self.get_sauce(media_cache, index_no=index, log_index=self.my.screen_name)
-                await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
-                                      blocked=media_cache.blocked)
-            except TwSauceNoMediaException:
-                self.log.debug(f"[{self.my.screen_name}] Tweet {tweet.id} has no media to process, ignoring")
-                continue
-            except Exception:
-                self.log.exception(f"[{self.my.screen_name}] An unknown error occurred while processing tweet {tweet.id}")
-                continue
+        # Twitter asks clients being rate limited to back off exponentially, reconnecting too soon only extends it
+        if listener.status_code in (420, 429):
+            delay = self._stream_backoff
+            self._stream_backoff = min(self._stream_backoff * 2, 900.0)
+        else:
+            delay = self._stream_backoff = 60.0
+
+        self.log.warning(f"[{self.my.screen_name}] Mention stream disconnected; reconnecting in {delay} seconds")
+        return delay
+
+    # noinspection PyBroadException
+    async def _process_mention(self, tweet) -> None:
+        """
+        Look up and respond to a single mention
+        Args:
+            tweet: tweepy.models.Status
+
+        Returns:
+            None
+        """
+        try:
+            # Make sure we aren't mentioning ourselves
+            if tweet.author.id == self.my.id:
+                self.log.debug(f"[{self.my.screen_name}] Skipping a self-referencing tweet")
+                return
+
+            # Attempt to parse the tweets media content
+            original_cache, media_cache, media = await self.get_closest_media(tweet, self.my.screen_name)
+            if media_cache.tweet.author.id == self.my.id:
+                self.log.info("Not performing a sauce lookup to our own tweet")
+                return
+
+            # Did we request a specific index?
+            index = self._determine_requested_index(tweet, media_cache)
+
+            # Get the sauce!
+            sauce_cache = await self.get_sauce(media_cache, index_no=index, log_index=self.my.screen_name)
+            await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
+                                  blocked=media_cache.blocked)
+        except TwSauceNoMediaException:
+            self.log.debug(f"[{self.my.screen_name}] Tweet {tweet.id} has no media to process, ignoring")
+        except Exception:
+            self.log.exception(f"[{self.my.screen_name}] An unknown error occurred while processing tweet {tweet.id}")
 
     async def check_monitored(self) -> None:
         """
@@ -153,90 +331,191 @@ class TwitterSauce:
         Returns:
             None
         """
-        monitored_accounts = str(config.get('Twitter', 'monitored_accounts'))
-        if not monitored_accounts:
+        if not self.monitored_accounts:
             return
 
-        monitored_accounts = [a.strip() for a in monitored_accounts.split(',')]
+        await asyncio.gather(*[self._check_monitored_account(a) for a in self.monitored_accounts],
+                             return_exceptions=True)
+
+    # noinspection PyBroadException
+    async def _check_monitored_account(self, account: str) -> None:
+        """
+        Checks a single monitored account for any new tweets
+        Args:
+            account (str): The monitored account to check
 
-        for account in monitored_accounts:
+        Returns:
+            None
+        """
+        try:
             # Have we fetched a tweet for this account yet?
             if account not in self.monitored_since:
-                # If not, get the last tweet ID from this account and wait for the next post
-                tweet = next(tweepy.Cursor(api.user_timeline, account, page=1, tweet_mode='extended').items())
-                self.monitored_since[account] = tweet.id
-                self.log.info(f"[{account}] Monitoring tweets after {tweet.id}")
-                continue
+                # Resume from where we left off before our last restart if we can
+                since_id = TwitterCheckpoint.fetch(f"monitored:{account}")
+                if since_id is not None:
+                    self.monitored_since[account] = since_id
+                else:
+                    # If not, get the last tweet ID from this account and wait for the next post
+                    # StopIteration can't be raised into a Future, so we use a default for accounts with no tweets
+                    tweet = await run_async(lambda: next(iter(tweepy.Cursor(api.user_timeline, account, page=1, tweet_mode='extended').items()), None))
+                    since_id = tweet.id if tweet else 0
+                    self.monitored_since[account] = since_id
+                    TwitterCheckpoint.set(f"monitored:{account}", since_id)
+                    self.log.info(f"[{account}] Monitoring tweets after {since_id}")
+                    return
 
             # Get all tweets since our last check
             self.log.info(f"[{account}] Retrieving tweets since {self.monitored_since[account]}")
-            tweets = [*tweepy.Cursor(api.user_timeline, account, since_id=self.monitored_since[account], tweet_mode='extended').items()]
+            since_id = self.monitored_since[account]
+            tweets = await run_async(lambda: [*tweepy.Cursor(api.user_timeline, account, since_id=since_id, tweet_mode='extended').items()])
             self.log.info(f"[{account}] {len(tweets)} tweets found")
-            for tweet in tweets:
-                try:
-                    # Update the ID cutoff before attempting to parse the tweet
-                    self.monitored_since[account] = max([self.monitored_since[account], tweet.id])
-
-                    # Make sure this isn't a comment / reply
-                    if tweet.in_reply_to_status_id:
-                        self.log.info(f"[{account}] Tweet is a reply/comment; ignoring")
-                        continue
-
-                    # Make sure we haven't already processed this post
-                    if tweet.id in self._posts_processed:
-                        self.log.info(f"[{account}] Post has already been processed; ignoring")
-                        continue
-                    self._posts_processed.append(tweet.id)
-
-                    # Make sure this isn't a re-tweet
-                    if 'RT @' in tweet.full_text or hasattr(tweet, 'retweeted_status'):
-                        self.log.info(f"[{account}] Retweeted post; ignoring")
-                        continue
+            if not tweets:
+                return
 
-                    original_cache, media_cache, media = self.get_closest_media(tweet, account)
-                    self.log.info(f"[{account}] Found new media post in tweet {tweet.id}: {media[0]}")
+            # Update the ID cutoff before attempting to parse any tweets
+            self.monitored_since[account] = max(self.monitored_since[account], max(tweet.id for tweet in tweets))
 
-                    # Get the sauce
-                    sauce_cache = await self.get_sauce(media_cache, log_index=account, trigger=TRIGGER_MONITORED)
-                    sauce = sauce_cache.sauce
+            await self._enqueue(f"monitored:{account}", self.monitored_since[account], tweets,
+                                self._process_monitored, account)
+        except Exception:
+            self.log.exception(f"[{account}] An unknown error occurred while checking for new tweets")
 
-                    self.log.info(f"[{account}] Found {sauce.index} sauce for tweet {tweet.id}" if sauce
-                                  else f"[{account}] Failed to find sauce for tweet {tweet.id}")
+    # noinspection PyBroadException
+    async def _process_monitored(self, account: str, tweet) -> None:
+        """
+        Look up and respond to a single post from a monitored account
+        Args:
+            account (str): The monitored account this tweet was retrieved from
+            tweet: tweepy.models.Status
 
-                    await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
-                                          requested=False)
-                except TwSauceNoMediaException:
-                    self.log.info(f"[{account}] No sauce found for tweet {tweet.id}")
-                    continue
-                except Exception:
-                    self.log.exception(f"[{account}] An unknown error occurred while processing tweet {tweet.id}")
-                    continue
+        Returns:
+            None
+        """
+        try:
+            # Make sure this isn't a comment / reply
+            if tweet.in_reply_to_status_id:
+                self.log.info(f"[{account}] Tweet is a reply/comment; ignoring")
+                return
+
+            # Make sure we haven't already processed this post
+            if tweet.id in self._posts_processed:
+                self.log.info(f"[{account}] Post has already been processed; ignoring")
+                return
+            self._posts_processed[tweet.id] = None
+            if len(self._posts_processed) > self._posts_processed_max:
+                self._posts_processed.popitem(last=False)
+
+            # Make sure this isn't a re-tweet
+            if 'RT @' in tweet.full_text or hasattr(tweet, 'retweeted_status'):
+                self.log.info(f"[{account}] Retweeted post; ignoring")
+                return
+
+            original_cache, media_cache, media = await self.get_closest_media(tweet, account)
+            self.log.info(f"[{account}] Found new media post in tweet {tweet.id}: {media[0]}")
+
+            # Get the sauce
+            sauce_cache = await self.get_sauce(media_cache, log_index=account, trigger=TRIGGER_MONITORED)
+            sauce = sauce_cache.sauce
+
+            self.log.info(f"[{account}] Found {sauce.index} sauce for tweet {tweet.id}" if sauce
+                          else f"[{account}] Failed to find sauce for tweet {tweet.id}")
+
+            await self.send_reply(tweet_cache=original_cache, media_cache=media_cache, sauce_cache=sauce_cache,
+                                  requested=False)
+        except TwSauceNoMediaException:
+            self.log.info(f"[{account}] No sauce found for tweet {tweet.id}")
+        except Exception:
+            self.log.exception(f"[{account}] An unknown error occurred while processing tweet {tweet.id}")
 
     async def get_sauce(self, tweet_cache: TweetCache, index_no: int = 0, log_index: typing.Optional[str] = None,
                         trigger: str = TRIGGER_MENTION) -> TweetSauceCache:
         """
         Get the sauce of a media tweet
+        Concurrent requests for the same media (e.g. several people mentioning us on the same post) share one lookup
+        """
+        key = (tweet_cache.tweet_id, index_no)
+        lookup = self._pending_lookups.get(key)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._lookup_sauce(tweet_cache, index_no, log_index, trigger))
+            self._pending_lookups[key] = lookup
+            lookup.add_done_callback(lambda _: self._pending_lookups.pop(key, None))
+        else:
+            self.log.debug(f"[{log_index or 'SYSTEM'}] Sauce lookup for tweet {tweet_cache.tweet_id} on indice {index_no} already in progress")
+
+        return await asyncio.shield(lookup)
+
+    async def _lookup_sauce(self, tweet_cache: TweetCache, index_no: int = 0, log_index: typing.Optional[str] = None,
+                            trigger: str = TRIGGER_MENTION) -> TweetSauceCache:
+        """
+        Perform a (cached) sauce lookup, waiting out any API limits we run into
         """
         log_index = log_index or 'SYSTEM'
 
-        # Have we cached the sauce already?
+        # Have we cached the sauce already? Cached results never need to wait on SauceNao's API limits.
+        sauce_cache = TweetSauceCache.fetch(tweet_cache.tweet_id, index_no)
+        if sauce_cache:
+            return sauce_cache
+
+        # If SauceNao appears to be down, don't bother waiting on it. Cached results have already been served above.
+        if time.monotonic() < self._circuit_open_until:
+            self.log.info(f"[{log_index}] SauceNao is unavailable; skipping lookup for tweet {tweet_cache.tweet_id}")
+            return TweetSauceCache.set(tweet_cache, index_no=index_no, trigger=trigger, failed=True)
+
         try:
             sauce_manager = SauceManager(tweet_cache, trigger)
-            return await sauce_manager.get(index_no)
+
+            # If we're being throttled, wait for the limit to clear along with every other pending lookup.
+            # The throttle may have started while we were waiting on the semaphore, so check again once we have it.
+            while True:
+                await self._limit_gate.wait()
+                async with self._sauce_semaphore:
+                    if not self._limit_gate.is_set():
+                        continue
+
+                    sauce_cache = await sauce_manager.get(index_no)
+                    break
+
+            # Only an actual SauceNao request getting through means the limit has cleared and SauceNao is up
+            self._limit_backoff = 5.0
+            self._consecutive_errors = 0
+            return sauce_cache
         except ShortLimitReachedException:
-            self.log.warning(f"[{log_index}] Short API limit reached, throttling for 30 seconds")
-            await asyncio.sleep(30.0)
-            return await self.get_sauce(tweet_cache, index_no, log_index)
+            # Only the first lookup to hit the limit starts the throttle; anything else in flight just queues back up
+            if self._limit_gate.is_set():
+                self.log.warning(f"[{log_index}] Short API limit reached, throttling for {self._limit_backoff:.0f} seconds")
+                self._throttle(self._limit_backoff)
+                self._limit_backoff = min(self._limit_backoff * 2, 60.0)
+            return await self._lookup_sauce(tweet_cache, index_no, log_index, trigger)
         except DailyLimitReachedException:
-            self.log.error(f"[{log_index}] Daily API limit reached, throttling for 15 minutes. Please consider upgrading your API key.")
-            await asyncio.sleep(900.0)
-            return await self.get_sauce(tweet_cache, index_no, log_index)
+            if self._limit_gate.is_set():
+                self.log.error(f"[{log_index}] Daily API limit reached, throttling for 15 minutes. Please consider upgrading your API key.")
+                self._throttle(900.0)
+            return await self._lookup_sauce(tweet_cache, index_no, log_index, trigger)
         except SauceNaoException as e:
             self.log.error(f"[{log_index}] SauceNao exception raised: {e}")
-            sauce_cache = TweetSauceCache.set(tweet_cache, index_no=index_no, trigger=trigger)
+
+            # Too many errors in a row? Stop querying SauceNao for a while.
+            self._consecutive_errors += 1
+            if self._consecutive_errors >= 5 and time.monotonic() >= self._circuit_open_until:
+                self.log.warning(f"[{log_index}] {self._consecutive_errors} consecutive SauceNao errors, suspending lookups for 60 seconds")
+                self._circuit_open_until = time.monotonic() + 60.0
+
+            sauce_cache = TweetSauceCache.set(tweet_cache, index_no=index_no, trigger=trigger, failed=True)
             return sauce_cache
 
-    def get_closest_media(self, tweet, log_index: typing.Optional[str] = None) -> typing.Optional[typing.Tuple[TweetCache, TweetCache, typing.List[str]]]:
+    def _throttle(self, delay: float) -> None:
+        """
+        Suspend all SauceNao lookups for the specified number of seconds
+        Args:
+            delay (float): How long to throttle lookups for
+
+        Returns:
+            None
+        """
+        self._limit_gate.clear()
+        asyncio.get_event_loop().call_later(delay, self._limit_gate.set)
+
+    async def get_closest_media(self, tweet, log_index: typing.Optional[str] = None) -> typing.Optional[typing.Tuple[TweetCache, TweetCache, typing.List[str]]]:
         """
         Attempt to get the closest media element associated with this tweet and handle any errors if they occur
         Args:
@@ -249,14 +528,14 @@ class TwitterSauce:
         log_index = log_index or 'SYSTEM'
 
         try:
-            original_cache, media_cache, media = self.twitter.get_closest_media(tweet)
+            original_cache, media_cache, media = await self.twitter.get_closest_media(tweet)
         except tweepy.error.TweepError as error:
             # Error 136 means we are blocked
             if error.api_code == 136:
                 # noinspection PyBroadException
                 try:
                     message = lang('Errors', 'blocked', user=tweet.author)
-                    self._post(msg=message, to=tweet.id)
+                    await self._post(msg=message, to=tweet.id)
                 except Exception as error:
                     self.log.exception(f"[{log_index}] An exception occurred while trying to inform a user that an account has blocked us")
                 raise TwSauceNoMediaException
@@ -311,19 +590,19 @@ class TwitterSauce:
                 message = lang('Errors', 'no_results',
                                {'yandex_url': yandex_url, 'tinyeye_url': tinyeye_url, 'google_url': google_url},
                                user=tweet.author)
-                self._post(msg=message, to=tweet.id)
+                await self._post(msg=message, to=tweet.id)
             return
 
         # Get the artists Twitter handle if possible
         twitter_sauce = None
         if isinstance(sauce, PixivSource):
-            twitter_sauce = self.pixiv.get_author_twitter(sauce.data['member_id'])
+            twitter_sauce = await run_async(self.pixiv.get_author_twitter, sauce.data['member_id'])
 
         # If we're requesting sauce from the original artist, just say so
         if twitter_sauce and twitter_sauce.lstrip('@').lower() == media_cache.tweet.author.screen_name.lower():
             self.log.info("User requested sauce from a post by the original artist")
             message = lang('Errors', 'sauced_the_artist')
-            self._post(message, to=tweet.id)
+            await self._post(message, to=tweet.id)
             return
 
         # Lines with priority attributes incase we need to shorten them
@@ -343,16 +622,11 @@ class TwitterSauce:
             if self.anime_link in ['anidb', 'all']:
                 sauce_urls.append(sauce.url)
 
-        # For limiting the length of the title/author
-        _repr = reprlib.Repr()
-        _repr.maxstring = 32
-
         # H-Misc doesn't have a source to link to, so we need to try and provide the full title
         if sauce.index not in ['H-Misc', 'E-Hentai']:
-            title = _repr.repr(sauce.title).strip("'")
+            title = self._repr.repr(sauce.title).strip("'")
         else:
-            _repr.maxstring = 128
-            title = _repr.repr(sauce.title).strip("'")
+            title = self._repr_long.repr(sauce.title).strip("'")
 
         # Format the similarity string
         similarity = lang('Accuracy', 'prefix', {'similarity': sauce.similarity})
@@ -389,7 +663,7 @@ class TwitterSauce:
 
         # Print the author name if available
         if sauce.author_name:
-            author = _repr.repr(sauce.author_name).strip("'")
+            author = self._repr.repr(sauce.author_name).strip("'")
             reply = lang('Results', 'author', {'author': author})
             lines.append(ReplyLine(reply, newlines=1))
 
@@ -434,21 +708,21 @@ class TwitterSauce:
 
         # trace.moe time! Let's get a video preview
         if sauce_cache.media_id:
-            comment = self._post(msg=lines, to=tweet.id, media_ids=[sauce_cache.media_id])
+            comment = await self._post(msg=lines, to=tweet.id, media_ids=[sauce_cache.media_id])
 
         # This was hentai and we want to avoid uploading hentai clips to this account
         else:
-            comment = self._post(msg=lines, to=tweet.id)
+            comment = await self._post(msg=lines, to=tweet.id)
 
         # If we've been blocked by this user and have the artists Twitter handle, send the artist a DMCA guide
         if blocked and twitter_sauce:
             self.log.info(f"Sending {twitter_sauce} DMCA takedown advice")
             message = lang('Errors', 'blocked_dmca', {'twitter_artist': twitter_sauce})
             # noinspection PyUnboundLocalVariable
-            self._post(msg=message, to=comment.id)
+            await self._post(msg=message, to=comment.id)
 
-    def _post(self, msg: typing.Union[str, typing.List[ReplyLine]], to: typing.Optional[int], media_ids: typing.Optional[typing.List[int]] = None,
-              sensitive: bool = False):
+    async def _post(self, msg: typing.Union[str, typing.List[ReplyLine]], to: typing.Optional[int], media_ids: typing.Optional[typing.List[int]] = None,
+                    sensitive: bool = False):
         """
         Perform a twitter API status update
         Args:
@@ -474,7 +748,7 @@ class TwitterSauce:
             msg = ''.join(map(str, lines))
 
         try:
-            return api.update_status(msg, **kwargs)
+            return await run_async(api.update_status, msg, **kwargs)
         except tweepy.error.TweepError as error:
             if error.api_code == 136:
                 self.log.warning("A user requested our presence, then blocked us before we could respond. Wow.")
@@ -489,16 +763,16 @@ class TwitterSauce:
             # Video was too short. Can happen if we're using natural previews. Repost without the video clip
             elif error.api_code == 324:
                 self.log.info(f"Video preview for was too short to upload to Twitter")
-                return self._post(msg=msg, to=to, sensitive=sensitive)
+                return await self._post(msg=msg, to=to, sensitive=sensitive)
             # Something unfamiliar happened, log an error for later review
             elif error.api_code == 186 and lines:
                 self.log.debug("Post is too long; scrubbing message length")
 
-                def _retry(_lines):
+                async def _retry(_lines):
                     _lines = self._shorten_reply(_lines)
                     try:
                         _msg = ''.join(map(str, _lines))
-                        return api.update_status(_msg, **kwargs)
+                        return await run_async(api.update_status, _msg, **kwargs)
                     except tweepy.TweepError as error:
                         if error.api_code != 186:
                             raise error
@@ -508,7 +782,7 @@ class TwitterSauce:
                 # Shorten the post as much as we can until it fits
                 while True:
                     try:
-                        success = _retry(lines)
+                        success = await _retry(lines)
                     except IndexError:
                         self.log.warning(f"Failed to shorten response message to tweet {to} enough")
                         break
@@ -1,10 +1,11 @@
+import asyncio
 import logging
 from typing import List, Optional, Tuple
 
 import tweepy
 
 from twsaucenao import SAUCENAOPLS_TWITTER_ID
-from twsaucenao.api import api, readonly_api
+from twsaucenao.api import api, readonly_api, run_async
 from twsaucenao.errors import TwSauceNoMediaException
 from twsaucenao.models.database import TweetCache, TwitterBlocklist
 
@@ -17,7 +18,7 @@ class TweetManager:
         self.log = logging.getLogger(__name__)
         self.my = api.me()
 
-    def get_tweet(self, tweet_id: int) -> TweetCache:
+    async def get_tweet(self, tweet_id: int) -> TweetCache:
         """
         Performs a lookup on the given tweet ID.
         Attempts to load the tweet from database cache first, and if that fails, executes a Twitter API query.
@@ -35,14 +36,14 @@ class TweetManager:
         # If it's not cached yet, fetch the tweet from the API
         blocked = False
         try:
-            _tweet = api.get_status(tweet_id, tweet_mode='extended')
+            _tweet = await run_async(api.get_status, tweet_id, tweet_mode='extended')
         except tweepy.TweepError as error:
             # If we're blocked, use readonly parsing if configured, otherwise log an error and re-throw the exception
             if error.api_code == 136:
                 blocked = True
                 if readonly_api:
                     self.log.warning(f"User has blocked the main account; falling back to read-only API for media parsing on tweet {tweet_id}")
-                    _tweet = readonly_api.get_status(tweet_id, tweet_mode='extended')
+                    _tweet = await run_async(readonly_api.get_status, tweet_id, tweet_mode='extended')
 
                     # Add this account to our blocklist
                     TwitterBlocklist.add(_tweet.author)
@@ -55,7 +56,32 @@ class TweetManager:
         # Cache and return
         return TweetCache.set(_tweet, bool(self.extract_media(_tweet)), blocked=blocked)
 
-    def get_closest_media(self, tweet) -> Tuple[TweetCache, TweetCache, List[str]]:
+    async def prefetch_tweets(self, tweet_ids: List[int]) -> None:
+        """
+        Batch lookup and cache any of the given tweets we haven't cached yet.
+        Tweets are requested up to 100 at a time, so replies sharing a batch cost a single API call instead of one each.
+        Tweets we can't view are silently omitted by Twitter and will be handled by get_tweet() as usual.
+        Args:
+            tweet_ids (List[int]): The tweet ID's to look up
+
+        Returns:
+            None
+        """
+        tweet_ids = [i for i in dict.fromkeys(tweet_ids) if not TweetCache.fetch(i)]
+
+        for offset in range(0, len(tweet_ids), 100):
+            chunk = tweet_ids[offset:offset + 100]
+            self.log.debug(f"Prefetching {len(chunk)} tweets")
+            try:
+                tweets = await run_async(api.statuses_lookup, chunk, tweet_mode='extended')
+            except tweepy.TweepError as error:
+                self.log.warning(f"Failed to prefetch tweets: {error.api_code} - {error.reason}")
+                continue
+
+            for tweet in tweets:
+                TweetCache.set(tweet, bool(self.extract_media(tweet)))
+
+    async def get_closest_media(self, tweet) -> Tuple[TweetCache, TweetCache, List[str]]:
         """
         Find the closet media post associated with this tweet.
         This could be this tweet itself if someone has mentioned us with an upload.
@@ -73,7 +99,7 @@ class TweetManager:
             the second entry is the tweet we pulled media from. Third item is the actual list of media.
         """
         # Check if this is a reply to one of our posts first
-        if self._is_bot_reply(tweet):
+        if await self._is_bot_reply(tweet):
             self.log.info('Skipping a tweet that is a comment on a post by the bot account')
             raise TwSauceNoMediaException
 
@@ -87,7 +113,7 @@ class TweetManager:
         # The tweet itself doesn't have any media entities. Time to traverse and look for one
         while tweet.in_reply_to_status_id:
             self.log.info(f'Looking up parent tweet ID ( {tweet.id} => {tweet.in_reply_to_status_id} )')
-            cache = self.get_tweet(tweet.in_reply_to_status_id)
+            cache = await self.get_tweet(tweet.in_reply_to_status_id)
             tweet = cache.tweet
 
             # If this is our own post, that means we've already responded to this thread and need to abort, as all
@@ -107,7 +133,7 @@ class TweetManager:
 
         return _cache, cache, self.extract_media(tweet)
 
-    def _is_bot_reply(self, tweet) -> bool:
+    async def _is_bot_reply(self, tweet) -> bool:
         """
         Check and see if this tweet is a reply to a post made by the bots account.
         We can't support queries for the sauce on our own posts, so we just assume we're responsible enough to supply
@@ -119,7 +145,7 @@ class TweetManager:
             bool
         """
         if tweet.in_reply_to_status_id:
-            parent = self.get_tweet(tweet.in_reply_to_status_id)
+            parent = await self.get_tweet(tweet.in_reply_to_status_id)
             if (parent.tweet.author.id == self.my.id) or (parent.tweet.author.id == SAUCENAOPLS_TWITTER_ID):
                 return True
 
@@ -150,13 +176,10 @@ class TweetManager:
         Returns:
             Optional[List[dict]]
         """
-        try:
-            media = tweet.extended_entities['media']  # type: List[dict]
-        except AttributeError:
-            try:
-                media = tweet.entities['media']  # type: List[dict]
-            except KeyError:
-                return None
+        extended_entities = getattr(tweet, 'extended_entities', None) or {}
+        media = extended_entities.get('media') or tweet.entities.get('media')  # type: Optional[List[dict]]
+        if not media:
+            return None
 
         return [m['media_url_https'] for m in media]
 
@@ -169,3 +192,47 @@ class ReplyLine:
 
     def __str__(self):
         return ("\n" * self.newlines) + self.message
+
+
+class MentionStreamListener(tweepy.StreamListener):
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        """
+        Hands tweets received from the streaming API (which runs in its own thread) over to the event loop
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop to deliver tweets to
+            queue (asyncio.Queue): The queue received tweets are pushed on to
+        """
+        super().__init__(api)
+        self.log = logging.getLogger(__name__)
+        self._loop = loop
+        self._queue = queue
+        self.status_code = None
+
+    def on_status(self, status):
+        # Retweets of a mention aren't requests for the sauce
+        if hasattr(status, 'retweeted_status'):
+            return
+
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, self._extend(status))
+
+    def on_error(self, status_code):
+        self.log.error(f"Mention stream returned a {status_code} error; disconnecting")
+        self.status_code = status_code
+        return False
+
+    @staticmethod
+    def _extend(status):
+        """
+        Streamed tweets use the compatibility format, where the full text and media entities of long tweets are nested
+        under `extended_tweet`. Flatten them so the tweet looks the same as one requested with tweet_mode=extended.
+        Args:
+            status: tweepy.models.Status
+
+        Returns:
+            tweepy.models.Status
+        """
+        # noinspection PyProtectedMember
+        data = dict(status._json)
+        data.update(data.pop('extended_tweet', {}))
+        data.setdefault('full_text', data.get('text', ''))
+        return tweepy.models.Status.parse(api, data)